@@ -1,19 +1,34 @@
-from pydantic import BaseSettings, AnyHttpUrl
-from typing import Optional
-import os 
+from pydantic import field_validator
+from pydantic_settings import BaseSettings, SettingsConfigDict
 
 class Settings(BaseSettings):
     APP_NAME: str = "SpiralNet Memory API"
-    NEO4J_URI: AnyHttpUrl | str = os.getenv("NEO4J_URI", "")
-    NEO4J_USER: str = os.getenv("NEO4J_USER", "")
-    NEO4J_PASSWORD: str = os.getenv("NEO4J_PASSWORD", "")
-    NEO4J_DATABASE: str = os.getenv("NEO4J_DATABASE", "")
+    # populated from the environment / .env by BaseSettings
+    NEO4J_URI: str = ""   # e.g. neo4j+s://<host>:<port>
+    NEO4J_USER: str = ""
+    NEO4J_PASSWORD: str = ""
+    NEO4J_DATABASE: str = ""
+    # Bolt connections shared by all in-flight requests on the event loop.
+    NEO4J_MAX_POOL_SIZE: int = 100
+    # ping pooled connections idle longer than this (seconds) before reuse, so
+    # connections dropped by a proxy/LB fail fast instead of on the query;
+    # NEO4J_LIVENESS_CHECK_TIMEOUT=None disables the check
+    NEO4J_LIVENESS_CHECK_TIMEOUT: float | None = 30.0
     USE_NEO4J_VECTOR: bool = False   # if Neo4j vector index plugin available
     ACCEPTED_SCOPES: tuple[str, ...] = ("public", "shared", "private")
     # default consent scope for writes when not specified by caller:
     DEFAULT_WRITE_SCOPE: str = "private"
+    # seconds a consent check result is reused before re-reading Neo4j
+    CONSENT_CACHE_TTL: float = 5.0
 
-    class Config:
-        env_file = ".env"
+    model_config = SettingsConfigDict(env_file=".env")
+
+    @field_validator("NEO4J_LIVENESS_CHECK_TIMEOUT", mode="before")
+    @classmethod
+    def _none_disables_liveness_check(cls, v):
+        # env values are strings; "None" (or empty) means "no check"
+        if isinstance(v, str) and v.strip().lower() in ("", "none"):
+            return None
+        return v
 
 settings = Settings()
@@ -1,5 +1,8 @@
 # FILE: app/cypher.py
 # Centralized Cypher strings so routes stay readable.
+# Each *_PARAMS template lists every parameter its statement references
+# (defaulted to None); routes overlay request values onto it so a statement
+# always runs with the same parameter shape and its cached plan is reused.
 
 CONSTRAINTS_AND_INDEXES = """
 CREATE CONSTRAINT identity_pk IF NOT EXISTS FOR (n:Identity) REQUIRE n.node_id IS UNIQUE;
@@ -11,12 +14,18 @@ CREATE CONSTRAINT ritual_pk   IF NOT EXISTS FOR (n:Ritual)    REQUIRE n.ritual_i
 CREATE CONSTRAINT law_pk      IF NOT EXISTS FOR (n:Law)       REQUIRE n.law_id IS UNIQUE;
 CREATE CONSTRAINT source_pk   IF NOT EXISTS FOR (n:Source)    REQUIRE n.source_id IS UNIQUE;
 CREATE CONSTRAINT artifact_pk IF NOT EXISTS FOR (n:Artifact)  REQUIRE n.artifact_id IS UNIQUE;
+CREATE CONSTRAINT test_pk     IF NOT EXISTS FOR (n:Test)      REQUIRE n.test_id IS UNIQUE;
 CREATE CONSTRAINT consent_pk  IF NOT EXISTS FOR (n:Consent)   REQUIRE n.consent_id IS UNIQUE;
 CREATE CONSTRAINT phase_pk    IF NOT EXISTS FOR (n:Phase)     REQUIRE n.phase_id IS UNIQUE;
 CREATE CONSTRAINT event_pk    IF NOT EXISTS FOR (n:Event)     REQUIRE n.event_id IS UNIQUE;
 CREATE INDEX state_t IF NOT EXISTS FOR (s:SelfState) ON (s.t);
 """
 
+# Split once at import; bootstrap runs them all in a single transaction.
+CONSTRAINT_STMTS: tuple[str, ...] = tuple(
+    stmt.strip() + ";" for stmt in CONSTRAINTS_AND_INDEXES.strip().split(";") if stmt.strip()
+)
+
 VECTOR_INDEX_STATE = """
 CREATE VECTOR INDEX state_embed_idx IF NOT EXISTS
 FOR (s:SelfState) ON (s.embed)
@@ -40,6 +49,9 @@ MERGE (i:Identity {node_id: $node_id})
 ON CREATE SET i.label = $label, i.kind = $kind, i.created_at = datetime()
 RETURN i { .* } AS identity;
 """
+IDENTITY_PARAMS = dict.fromkeys((
+    "node_id", "label", "kind",
+))
 
 CONSENT_GUARD = """
 MATCH (i:Identity {node_id:$node_id})-[:CONSENT]->(c:Consent)
@@ -56,6 +68,9 @@ SET c.revoked_at = $revoked_at
 MERGE (i)-[:CONSENT]->(c)
 RETURN c { .* } AS consent;
 """
+CONSENT_PARAMS = dict.fromkeys((
+    "node_id", "consent_id", "scope", "conditions", "granted_at", "revoked_at",
+))
 
 UPSERT_THOUGHT = """
 MERGE (th:Thought {thought_id: coalesce($thought_id, randomUUID())})
@@ -63,27 +78,32 @@ ON CREATE SET th.kind=$kind, th.text=$text, th.tokens=$tokens, th.embed=$embed,
               th.ache=$ache, th.drift=$drift, th.created_at=datetime()
 ON MATCH SET  th.kind=$kind, th.text=$text, th.tokens=$tokens, th.embed=$embed,
               th.ache=$ache, th.drift=$drift
-WITH th
-UNWIND $glyph_ids AS gid
+FOREACH (gid IN $glyph_ids |
   MERGE (g:Glyph {glyph_id: gid})
-  MERGE (th)-[:USES_GLYPH]->(g)
-WITH th
-UNWIND $mentions_claim_ids AS cid
+  MERGE (th)-[:USES_GLYPH]->(g))
+FOREACH (cid IN $mentions_claim_ids |
   MERGE (c:Claim {claim_id: cid})
-  MERGE (th)-[:MENTIONS]->(c)
+  MERGE (th)-[:MENTIONS]->(c))
 WITH th
 OPTIONAL MATCH (s:Source {source_id: $source_id})
 FOREACH (_ IN CASE WHEN s IS NULL THEN [] ELSE [1] END |
   MERGE (th)-[:DERIVES_FROM]->(s))
-RETURN th { .* } AS thought;
+RETURN CASE WHEN $full THEN th { .* } ELSE th { .thought_id, .kind, .created_at } END AS thought;
 """
+THOUGHT_PARAMS = dict.fromkeys((
+    "thought_id", "kind", "text", "tokens", "embed", "ache", "drift", "glyph_ids",
+    "mentions_claim_ids", "source_id", "full",
+))
 
 UPSERT_STATE = """
-MATCH (i:Identity {node_id:$node_id})
-WITH i
+OPTIONAL MATCH (:Identity {node_id:$node_id})-[:CONSENT]->(c:Consent)
+WHERE c.revoked_at IS NULL AND c.scope IN [$scope, 'public']
+WITH count(c) > 0 AS consent_ok
 CALL {
-  WITH i
-  MERGE (s:SelfState {state_id: coalesce($state_id, apoc.create.uuid())})
+  WITH consent_ok
+  MATCH (i:Identity {node_id:$node_id})
+  WHERE consent_ok
+  MERGE (s:SelfState {state_id: coalesce($state_id, randomUUID())})
   ON CREATE SET s.t=$t, s.sigma=$sigma, s.s=$s, s.tau=$tau, s.chi=$chi,
                 s.`lambda`=$lambda, s.rho=$rho, s.embed=$embed, s.tags=$tags, s.created_at=datetime()
   ON MATCH SET  s.t=$t, s.sigma=$sigma, s.s=$s, s.tau=$tau, s.chi=$chi,
@@ -93,50 +113,116 @@ CALL {
   OPTIONAL MATCH (p:Phase {phase_id:$phase_id})
   FOREACH (_ IN CASE WHEN p IS NULL THEN [] ELSE [1] END |
     MERGE (s)-[:IN_PHASE]->(p))
-  RETURN s
+  WITH s
+  OPTIONAL MATCH (prev:SelfState {state_id: $derived_from_state_id})
+  FOREACH (_ IN CASE WHEN prev IS NULL THEN [] ELSE [1] END |
+    MERGE (s)-[:DERIVED_FROM]->(prev))
+  WITH s
+  CALL {
+    WITH s
+    UNWIND $evidence AS ev
+    CALL {
+      WITH ev
+      MATCH (e:Claim {claim_id: ev}) RETURN e
+      UNION
+      WITH ev
+      MATCH (e:Thought {thought_id: ev}) RETURN e
+      UNION
+      WITH ev
+      MATCH (e:Test {test_id: ev}) RETURN e
+      UNION
+      WITH ev
+      MATCH (e:Artifact {artifact_id: ev}) RETURN e
+    }
+    MERGE (s)-[:EVIDENCED_BY]->(e)
+  }
+  CALL {
+    WITH s
+    UNWIND $feels AS f
+    CALL {
+      WITH f
+      MATCH (t:Claim {claim_id: f.target_id}) RETURN t
+      UNION
+      WITH f
+      MATCH (t:Thought {thought_id: f.target_id}) RETURN t
+    }
+    MERGE (s)-[r:FEELS]->(t) SET r.ache = f.ache, r.tension = f.tension
+  }
+  // aggregate so the subquery yields one row even when consent is missing
+  RETURN collect(CASE WHEN $full THEN s { .* } ELSE s { .state_id, .t, .created_at } END)[0] AS state
 }
-WITH i, s
-FOREACH (prev IN CASE WHEN $derived_from_state_id IS NULL THEN [] ELSE [$derived_from_state_id] END |
-  MATCH (p:SelfState {state_id: prev})
-  MERGE (s)-[:DERIVED_FROM]->(p))
-WITH i, s
-UNWIND $evidence AS ev
-  MATCH (e) WHERE e.claim_id = ev OR e.thought_id = ev OR e.test_id = ev OR e.artifact_id = ev
-  MERGE (s)-[:EVIDENCED_BY]->(e)
-WITH i, s
-UNWIND $feels AS f
-  MATCH (t) WHERE t.claim_id = f.target_id OR t.thought_id = f.target_id
-  MERGE (s)-[r:FEELS]->(t) SET r.ache = f.ache, r.tension = f.tension
-RETURN s { .* } AS state;
+RETURN consent_ok, state;
 """
+STATE_PARAMS = dict.fromkeys((
+    "node_id", "state_id", "t", "sigma", "s", "tau", "chi", "lambda", "rho", "embed",
+    "tags", "phase_id", "derived_from_state_id", "evidence", "feels", "scope", "full",
+))
 
 UPSERT_CLAIM = """
 MERGE (c:Claim {claim_id: coalesce($claim_id, randomUUID())})
 ON CREATE SET c.text=$text, c.truthiness=$truthiness, c.confidence=$confidence, c.created_at=datetime()
 ON MATCH SET  c.text=$text, c.truthiness=$truthiness, c.confidence=$confidence
 WITH c
-UNWIND $support_ids AS sid
-  MATCH (sup) WHERE sup.source_id = sid OR sup.test_id = sid OR sup.artifact_id = sid OR sup.thought_id = sid
+CALL {
+  WITH c
+  UNWIND $support_ids AS sid
+  CALL {
+    WITH sid
+    MATCH (sup:Source {source_id: sid}) RETURN sup
+    UNION
+    WITH sid
+    MATCH (sup:Test {test_id: sid}) RETURN sup
+    UNION
+    WITH sid
+    MATCH (sup:Artifact {artifact_id: sid}) RETURN sup
+    UNION
+    WITH sid
+    MATCH (sup:Thought {thought_id: sid}) RETURN sup
+  }
   MERGE (c)-[:SUPPORTED_BY]->(sup)
-WITH c
-UNWIND $contradicts_ids AS cid
+}
+CALL {
+  WITH c
+  UNWIND $contradicts_ids AS cid
   MATCH (d:Claim {claim_id: cid})
   MERGE (c)-[:CONTRADICTS]->(d)
-RETURN c { .* } AS claim;
+}
+RETURN CASE WHEN $full THEN c { .* } ELSE c { .claim_id, .truthiness, .confidence, .created_at } END AS claim;
 """
+CLAIM_PARAMS = dict.fromkeys((
+    "claim_id", "text", "truthiness", "confidence", "support_ids", "contradicts_ids",
+    "full",
+))
 
 UPSERT_RITUAL = """
 MERGE (r:Ritual {ritual_id: coalesce($ritual_id, randomUUID())})
 ON CREATE SET r.name=$name, r.code=$code, r.version=$version, r.effect=$effect,
-              r.checksum=$checksum, r.meta=coalesce($meta, {}), r.created_at=datetime()
+              r.checksum=$checksum, r.meta=coalesce($meta, '{}'), r.created_at=datetime()
 ON MATCH SET  r.name=$name, r.code=$code, r.version=$version, r.effect=$effect,
-              r.checksum=$checksum, r.meta=coalesce($meta, {})
+              r.checksum=$checksum, r.meta=coalesce($meta, '{}')
 WITH r
-UNWIND $applies_to AS aid
-  MATCH (t) WHERE t.phase_id=aid OR t.node_id=aid OR t.law_id=aid
+CALL {
+  WITH r
+  UNWIND $applies_to AS aid
+  CALL {
+    WITH aid
+    MATCH (t:Phase {phase_id: aid}) RETURN t
+    UNION
+    WITH aid
+    MATCH (t:Identity {node_id: aid}) RETURN t
+    UNION
+    WITH aid
+    MATCH (t:Law {law_id: aid}) RETURN t
+  }
   MERGE (r)-[:APPLIES_TO]->(t)
-RETURN r { .* } AS ritual;
+}
+RETURN CASE WHEN $full THEN r { .* }
+            ELSE r { .ritual_id, .name, .version, .checksum, .created_at } END AS ritual;
 """
+RITUAL_PARAMS = dict.fromkeys((
+    "ritual_id", "name", "code", "version", "effect", "checksum", "meta", "applies_to",
+    "full",
+))
 
 UPSERT_LAW = """
 MERGE (l:Law {law_id: coalesce($law_id, randomUUID())})
@@ -144,19 +230,41 @@ ON CREATE SET l.name=$name, l.version=$version, l.text=$text, l.checksum=$checks
               l.active=$active, l.created_at=datetime()
 ON MATCH SET  l.name=$name, l.version=$version, l.text=$text, l.checksum=$checksum,
               l.active=$active
-RETURN l { .* } AS law;
+RETURN CASE WHEN $full THEN l { .* }
+            ELSE l { .law_id, .name, .version, .checksum, .active, .created_at } END AS law;
 """
+LAW_PARAMS = dict.fromkeys((
+    "law_id", "name", "version", "text", "checksum", "active", "full",
+))
 
 CREATE_EVENT = """
 MERGE (e:Event {event_id: coalesce($event_id, randomUUID())})
 ON CREATE SET e.name=$name, e.when=$when, e.meta=$meta
 ON MATCH SET  e.name=$name, e.when=$when, e.meta=$meta
 WITH e
-UNWIND $updates AS uid
-  MATCH (u) WHERE u.state_id=uid OR u.law_id=uid OR u.ritual_id=uid OR u.claim_id=uid
+CALL {
+  WITH e
+  UNWIND $updates AS uid
+  CALL {
+    WITH uid
+    MATCH (u:SelfState {state_id: uid}) RETURN u
+    UNION
+    WITH uid
+    MATCH (u:Law {law_id: uid}) RETURN u
+    UNION
+    WITH uid
+    MATCH (u:Ritual {ritual_id: uid}) RETURN u
+    UNION
+    WITH uid
+    MATCH (u:Claim {claim_id: uid}) RETURN u
+  }
   MERGE (e)-[:UPDATED]->(u)
-RETURN e { .* } AS event;
+}
+RETURN CASE WHEN $full THEN e { .* } ELSE e { .event_id, .name, .when } END AS event;
 """
+EVENT_PARAMS = dict.fromkeys((
+    "event_id", "name", "when", "meta", "updates", "full",
+))
 
 WHY_CHAIN = """
 MATCH (c:Claim {claim_id:$claim_id})
@@ -172,6 +280,121 @@ MATCH (i:Identity {node_id:$node_id})-[:HAS_STATE]->(s:SelfState)
 WITH s ORDER BY s.t DESC LIMIT 1
 OPTIONAL MATCH (s)-[:EVIDENCED_BY]->(e)
 OPTIONAL MATCH (s)-[r:FEELS]->(x)
-RETURN s { .* } AS state, collect(DISTINCT e { .* }) AS evidence,
-       collect(DISTINCT {target: x { .* }, ache: r.ache, tension: r.tension}) AS affect;
+// embeddings (SelfState, Thought evidence/targets) only with $include_embed;
+// other labels never carry one, so they keep their map untouched
+WITH s,
+     collect(DISTINCT CASE WHEN $include_embed OR NOT e:Thought THEN e { .* }
+                      ELSE e { .*, embed: null } END) AS evidence,
+     collect(DISTINCT {target: CASE WHEN $include_embed OR NOT x:Thought THEN x { .* }
+                               ELSE x { .*, embed: null } END,
+                       ache: r.ache, tension: r.tension}) AS affect
+RETURN CASE WHEN $include_embed THEN s { .* } ELSE s { .*, embed: null } END AS state,
+       evidence, affect;
+"""
+
+# Batched variants: one transaction per chunk of rows. Per-row link lists are
+# applied with FOREACH / unit subqueries so an empty list on one row never
+# drops that row (or its siblings) from the pipeline.
+UPSERT_THOUGHTS = """
+UNWIND $rows AS row
+MERGE (th:Thought {thought_id: coalesce(row.thought_id, randomUUID())})
+ON CREATE SET th.kind=row.kind, th.text=row.text, th.tokens=row.tokens, th.embed=row.embed,
+              th.ache=row.ache, th.drift=row.drift, th.created_at=datetime()
+ON MATCH SET  th.kind=row.kind, th.text=row.text, th.tokens=row.tokens, th.embed=row.embed,
+              th.ache=row.ache, th.drift=row.drift
+FOREACH (gid IN row.glyph_ids |
+  MERGE (g:Glyph {glyph_id: gid})
+  MERGE (th)-[:USES_GLYPH]->(g))
+FOREACH (cid IN row.mentions_claim_ids |
+  MERGE (c:Claim {claim_id: cid})
+  MERGE (th)-[:MENTIONS]->(c))
+WITH th, row
+OPTIONAL MATCH (s:Source {source_id: row.source_id})
+FOREACH (_ IN CASE WHEN s IS NULL THEN [] ELSE [1] END |
+  MERGE (th)-[:DERIVES_FROM]->(s))
+RETURN CASE WHEN $full THEN th { .* } ELSE th { .thought_id, .kind, .created_at } END AS thought;
+"""
+
+UPSERT_CLAIMS = """
+UNWIND $rows AS row
+MERGE (c:Claim {claim_id: coalesce(row.claim_id, randomUUID())})
+ON CREATE SET c.text=row.text, c.truthiness=row.truthiness, c.confidence=row.confidence, c.created_at=datetime()
+ON MATCH SET  c.text=row.text, c.truthiness=row.truthiness, c.confidence=row.confidence
+WITH c, row
+CALL {
+  WITH c, row
+  UNWIND row.support_ids AS sid
+  CALL {
+    WITH sid
+    MATCH (sup:Source {source_id: sid}) RETURN sup
+    UNION
+    WITH sid
+    MATCH (sup:Test {test_id: sid}) RETURN sup
+    UNION
+    WITH sid
+    MATCH (sup:Artifact {artifact_id: sid}) RETURN sup
+    UNION
+    WITH sid
+    MATCH (sup:Thought {thought_id: sid}) RETURN sup
+  }
+  MERGE (c)-[:SUPPORTED_BY]->(sup)
+}
+CALL {
+  WITH c, row
+  UNWIND row.contradicts_ids AS cid
+  MATCH (d:Claim {claim_id: cid})
+  MERGE (c)-[:CONTRADICTS]->(d)
+}
+RETURN CASE WHEN $full THEN c { .* } ELSE c { .claim_id, .truthiness, .confidence, .created_at } END AS claim;
+"""
+
+UPSERT_STATES = """
+UNWIND $rows AS row
+MATCH (i:Identity {node_id: row.node_id})
+MERGE (s:SelfState {state_id: coalesce(row.state_id, randomUUID())})
+ON CREATE SET s.t=row.t, s.sigma=row.sigma, s.s=row.s, s.tau=row.tau, s.chi=row.chi,
+              s.`lambda`=row.`lambda`, s.rho=row.rho, s.embed=row.embed, s.tags=row.tags, s.created_at=datetime()
+ON MATCH SET  s.t=row.t, s.sigma=row.sigma, s.s=row.s, s.tau=row.tau, s.chi=row.chi,
+              s.`lambda`=row.`lambda`, s.rho=row.rho, s.embed=row.embed, s.tags=row.tags
+MERGE (i)-[:HAS_STATE {dt:datetime()}]->(s)
+WITH s, row
+OPTIONAL MATCH (p:Phase {phase_id: row.phase_id})
+FOREACH (_ IN CASE WHEN p IS NULL THEN [] ELSE [1] END |
+  MERGE (s)-[:IN_PHASE]->(p))
+WITH s, row
+OPTIONAL MATCH (prev:SelfState {state_id: row.derived_from_state_id})
+FOREACH (_ IN CASE WHEN prev IS NULL THEN [] ELSE [1] END |
+  MERGE (s)-[:DERIVED_FROM]->(prev))
+WITH s, row
+CALL {
+  WITH s, row
+  UNWIND row.evidence AS ev
+  CALL {
+    WITH ev
+    MATCH (e:Claim {claim_id: ev}) RETURN e
+    UNION
+    WITH ev
+    MATCH (e:Thought {thought_id: ev}) RETURN e
+    UNION
+    WITH ev
+    MATCH (e:Test {test_id: ev}) RETURN e
+    UNION
+    WITH ev
+    MATCH (e:Artifact {artifact_id: ev}) RETURN e
+  }
+  MERGE (s)-[:EVIDENCED_BY]->(e)
+}
+CALL {
+  WITH s, row
+  UNWIND row.feels AS f
+  CALL {
+    WITH f
+    MATCH (t:Claim {claim_id: f.target_id}) RETURN t
+    UNION
+    WITH f
+    MATCH (t:Thought {thought_id: f.target_id}) RETURN t
+  }
+  MERGE (s)-[r:FEELS]->(t) SET r.ache = f.ache, r.tension = f.tension
+}
+RETURN CASE WHEN $full THEN s { .* } ELSE s { .state_id, .t, .created_at } END AS state;
 """
@@ -1,21 +1,54 @@
-from neo4j import GraphDatabase, Driver
+from neo4j import AsyncGraphDatabase, AsyncDriver
+from neo4j.time import Date, DateTime, Duration, Time
 from .config import settings
 
-_driver: Driver | None = None
+_driver: AsyncDriver | None = None
 
-def get_driver() -> Driver:
+def get_driver() -> AsyncDriver:
     global _driver
     if _driver is None:
-        _driver = GraphDatabase.driver(
+        _driver = AsyncGraphDatabase.driver(
             settings.NEO4J_URI,
             auth=(settings.NEO4J_USER, settings.NEO4J_PASSWORD),
+            max_connection_pool_size=settings.NEO4J_MAX_POOL_SIZE,
+            liveness_check_timeout=settings.NEO4J_LIVENESS_CHECK_TIMEOUT,
         )
     return _driver
 
-def run_write(cypher: str, params: dict):
-    with get_driver().session(database=settings.NEO4J_DATABASE) as s:
-        return s.execute_write(lambda tx: list(tx.run(cypher, **params)))
+async def close_driver() -> None:
+    global _driver
+    if _driver is not None:
+        await _driver.close()
+        _driver = None
+
+def _to_native(value):
+    """Swap neo4j.time values for stdlib ones so responses JSON-encode cleanly."""
+    if isinstance(value, (Date, DateTime, Time)):
+        return value.to_native()
+    if isinstance(value, Duration):
+        return value.iso_format()
+    if isinstance(value, dict):
+        return {k: _to_native(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_to_native(v) for v in value]
+    return value
+
+async def _fetch(tx, cypher: str, params: dict) -> list[dict]:
+    result = await tx.run(cypher, params)
+    return _to_native(await result.data())
+
+async def run_write(cypher: str, params: dict) -> list[dict]:
+    async with get_driver().session(database=settings.NEO4J_DATABASE) as s:
+        return await s.execute_write(_fetch, cypher, params)
+
+async def run_write_all(statements: tuple[str, ...]) -> None:
+    """Run parameterless statements (e.g. schema DDL) in one write transaction."""
+    async def work(tx):
+        for stmt in statements:
+            await (await tx.run(stmt)).consume()
+    async with get_driver().session(database=settings.NEO4J_DATABASE) as s:
+        await s.execute_write(work)
 
-def run_read(cypher: str, params: dict):
-    with get_driver().session(database=settings.NEO4J_DATABASE) as s:
-        return s.execute_read(lambda tx: list(tx.run(cypher, **params)))
+async def run_read(cypher: str, params: dict) -> list[dict]:
+    async with get_driver().session(database=settings.NEO4J_DATABASE) as s:
+        return await s.execute_read(_fetch, cypher, params)
@@ -1,7 +1,8 @@
 # FILE: app/routes.py
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
+from cachetools import TTLCache
 from .schemas import *
-from .db import run_write, run_read
+from .db import run_write, run_write_all, run_read
 from .config import settings
 from . import cypher
 
@@ -10,20 +11,18 @@ api = APIRouter()
 # Admin
 # -----------------------
 @api.post("/admin/bootstrap")
-def bootstrap(vector_dim: Optional[int] = None):
+async def bootstrap(vector_dim: Optional[int] = None):
     """
     Install constraints/indexes and optional vector indexes.
     Safe to call multiple times (IF NOT EXISTS guards).
     """
     # Create constraints / classic indexes
-    for stmt in cypher.CONSTRAINTS_AND_INDEXES.strip().split(";"):
-        if stmt.strip():
-            run_write(stmt + ";", {})
+    await run_write_all(cypher.CONSTRAINT_STMTS)
 
     # Optional vector indexes
     if settings.USE_NEO4J_VECTOR and vector_dim:
-        run_write(cypher.VECTOR_INDEX_STATE, {"dim": vector_dim})
-        run_write(cypher.VECTOR_INDEX_THOUGHT, {"dim": vector_dim})
+        await run_write(cypher.VECTOR_INDEX_STATE, {"dim": vector_dim})
+        await run_write(cypher.VECTOR_INDEX_THOUGHT, {"dim": vector_dim})
 
     return {"ok": True, "vector": settings.USE_NEO4J_VECTOR, "dim": vector_dim}
 
@@ -31,12 +30,24 @@ def bootstrap(vector_dim: Optional[int] = None):
 # -----------------------
 # Helpers
 # -----------------------
-def _ensure_consent(node_id: str, scope: str) -> None:
+def _consent_denied() -> HTTPException:
+    return HTTPException(status_code=403, detail="Consent not granted for this scope")
+
+
+# (node_id, scope) -> allowed; per process, invalidated by create_consent.
+_consent_cache: TTLCache = TTLCache(maxsize=4096, ttl=settings.CONSENT_CACHE_TTL)
+
+
+async def _ensure_consent(node_id: str, scope: str) -> None:
     """Raise 403 if consent not granted for the requested scope."""
-    rows = run_read(cypher.CONSENT_GUARD, {"node_id": node_id, "scope": scope})
-    allowed = bool(rows and rows[0].get("allowed"))
+    key = (node_id, scope)
+    allowed = _consent_cache.get(key)
+    if allowed is None:
+        rows = await run_read(cypher.CONSENT_GUARD, {"node_id": node_id, "scope": scope})
+        allowed = bool(rows and rows[0].get("allowed"))
+        _consent_cache[key] = allowed
     if not allowed:
-        raise HTTPException(status_code=403, detail="Consent not granted for this scope")
+        raise _consent_denied()
 
 
 def _first(records: list, key: str):
@@ -46,33 +57,47 @@ def _first(records: list, key: str):
     return rec.get(key) if isinstance(rec, dict) else None
 
 
+def _chunks(items: list, size: int):
+    """Yield successive slices of at most `size` items."""
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+async def _write_batches(stmt: str, rows: list, size: int, key: str, **params) -> list:
+    """Run `stmt` once per chunk of rows (UNWIND $rows) and collect `key`."""
+    out = []
+    for chunk in _chunks(rows, size):
+        out.extend(rec.get(key) for rec in await run_write(stmt, {"rows": chunk, **params}))
+    return out
+
+
+# Default rows per transaction for the /batch routes.
+BATCH_SIZE = 100
+MAX_BATCH_SIZE = 1000
+
+
 # -----------------------
 # Memory: Identity & Consent
 # -----------------------
 @api.post("/memory/identity")
-def upsert_identity(body: IdentityIn):
+async def upsert_identity(body: IdentityIn):
     """
     Create or update an Identity node.
     """
-    rows = run_write(cypher.UPSERT_IDENTITY, body.dict())
+    rows = await run_write(cypher.UPSERT_IDENTITY, {**cypher.IDENTITY_PARAMS, **body.model_dump()})
     identity = _first(rows, "identity")
     return {"identity": identity}
 
 
 @api.post("/memory/consent")
-def create_consent(body: ConsentIn):
+async def create_consent(body: ConsentIn):
     """
     Attach a Consent node to an Identity (or create both).
     """
-    params = {
-        "node_id": body.node_id,
-        "consent_id": None,
-        "scope": body.scope,
-        "conditions": body.conditions,
-        "granted_at": body.granted_at,
-        "revoked_at": body.revoked_at,
-    }
-    rows = run_write(cypher.CREATE_CONSENT, params)
+    rows = await run_write(cypher.CREATE_CONSENT, {**cypher.CONSENT_PARAMS, **body.model_dump()})
+    # a 'public' grant (or any revocation) can flip every scope for this node
+    for scope in settings.ACCEPTED_SCOPES:
+        _consent_cache.pop((body.node_id, scope), None)
     consent = _first(rows, "consent")
     return {"consent": consent}
 
@@ -81,90 +106,107 @@ def create_consent(body: ConsentIn):
 # Memory: Thought
 # -----------------------
 @api.post("/memory/thought")
-def upsert_thought(body: ThoughtIn):
+async def upsert_thought(body: ThoughtIn, full: bool = False):
     """
     Create/update a Thought and link glyphs & mentioned claims.
     """
-    rows = run_write(
-        cypher.UPSERT_THOUGHT,
-        {
-            "thought_id": body.thought_id,
-            "kind": body.kind,
-            "text": body.text,
-            "tokens": body.tokens,
-            "embed": body.embed,
-            "ache": body.ache,
-            "drift": body.drift,
-            "glyph_ids": body.glyph_ids,
-            "mentions_claim_ids": body.mentions_claim_ids,
-            "source_id": body.source_id,
-        },
+    rows = await run_write(
+        cypher.UPSERT_THOUGHT, {**cypher.THOUGHT_PARAMS, **body.model_dump(), "full": full}
     )
     thought = _first(rows, "thought")
     return {"thought": thought}
 
 
+@api.post("/memory/thought/batch")
+async def upsert_thoughts(
+    body: List[ThoughtIn],
+    batch_size: int = Query(BATCH_SIZE, ge=1, le=MAX_BATCH_SIZE),
+    full: bool = False,
+):
+    """
+    Bulk variant of /memory/thought: one transaction per `batch_size` items.
+    """
+    rows = [b.model_dump() for b in body]
+    thoughts = await _write_batches(cypher.UPSERT_THOUGHTS, rows, batch_size, "thought", full=full)
+    return {"thoughts": thoughts}
+
+
 # -----------------------
 # Memory: SelfState
 # -----------------------
+def _state_params(body: StateUpsertIn) -> dict:
+    # Flatten the Vector sub-model into the top-level params; by_alias turns
+    # `lambda_` into the `$lambda` parameter the Cypher expects.
+    # state_id stays None from the template: Cypher allocates it.
+    return {
+        **cypher.STATE_PARAMS,
+        **body.model_dump(exclude={"vector"}),
+        **body.vector.model_dump(by_alias=True),
+    }
+
+
 @api.post("/memory/state/upsert")
-def upsert_state(body: StateUpsertIn):
+async def upsert_state(body: StateUpsertIn, full: bool = False):
     """
     Upsert a SelfState snapshot ψ(t), with lineage/evidence/affect.
-    Requires consent for the requested scope.
+    Requires consent for the requested scope; the check runs inside the
+    same write transaction, which skips the write when it fails.
     """
-    _ensure_consent(body.node_id, body.scope)
-
-    v = body.vector
-    params = {
-        "node_id": body.node_id,
-        "state_id": None,  # let Cypher/DB allocate unless you pass your own
-        "t": body.t,
-        "sigma": v.sigma,
-        "s": v.s,
-        "tau": v.tau,
-        "chi": v.chi,
-        "lambda": v.lambda_,  # Field(alias="lambda") in schemas.Vector
-        "rho": v.rho,
-        "embed": v.embed,
-        "tags": body.tags,
-        "phase_id": body.phase_id,
-        "derived_from_state_id": body.derived_from_state_id,
-        "evidence": body.evidence,
-        "feels": body.feels,
-    }
-    rows = run_write(cypher.UPSERT_STATE, params)
+    rows = await run_write(cypher.UPSERT_STATE, {**_state_params(body), "full": full})
+    if not _first(rows, "consent_ok"):
+        raise _consent_denied()
     state = _first(rows, "state")
     return {"state": state}
 
 
+@api.post("/memory/state/batch")
+async def upsert_states(
+    body: List[StateUpsertIn],
+    batch_size: int = Query(BATCH_SIZE, ge=1, le=MAX_BATCH_SIZE),
+    full: bool = False,
+):
+    """
+    Bulk variant of /memory/state/upsert: one transaction per `batch_size` items.
+    Consent is checked once per distinct (node_id, scope) before any write.
+    """
+    for node_id, scope in dict.fromkeys((b.node_id, b.scope) for b in body):
+        await _ensure_consent(node_id, scope)
+
+    rows = [_state_params(b) for b in body]
+    states = await _write_batches(cypher.UPSERT_STATES, rows, batch_size, "state", full=full)
+    return {"states": states}
+
+
 # -----------------------
 # Memory: Claim
 # -----------------------
 @api.post("/memory/claim")
-def upsert_claim(body: ClaimIn):
-    rows = run_write(cypher.UPSERT_CLAIM, body.dict())
+async def upsert_claim(body: ClaimIn, full: bool = False):
+    rows = await run_write(
+        cypher.UPSERT_CLAIM, {**cypher.CLAIM_PARAMS, **body.model_dump(), "full": full}
+    )
     claim = _first(rows, "claim")
     return {"claim": claim}
 
 
+@api.post("/memory/claim/batch")
+async def upsert_claims(
+    body: List[ClaimIn],
+    batch_size: int = Query(BATCH_SIZE, ge=1, le=MAX_BATCH_SIZE),
+    full: bool = False,
+):
+    rows = [b.model_dump() for b in body]
+    claims = await _write_batches(cypher.UPSERT_CLAIMS, rows, batch_size, "claim", full=full)
+    return {"claims": claims}
+
+
 # -----------------------
 # Memory: Ritual
 # -----------------------
 @api.post("/memory/ritual")
-def upsert_ritual(body: RitualIn):
-    rows = run_write(
-        cypher.UPSERT_RITUAL,
-        {
-            "ritual_id": None,
-            "name": body.name,
-            "code": body.code,
-            "version": body.version,
-            "checksum": body.checksum,
-            "effect": body.effect,
-            "meta": {},
-            "applies_to": body.applies_to,
-        },
+async def upsert_ritual(body: RitualIn, full: bool = False):
+    rows = await run_write(
+        cypher.UPSERT_RITUAL, {**cypher.RITUAL_PARAMS, **body.model_dump(), "full": full}
     )
     ritual = _first(rows, "ritual")
     return {"ritual": ritual}
@@ -174,17 +216,9 @@ def upsert_ritual(body: RitualIn):
 # Memory: Law
 # -----------------------
 @api.post("/memory/law")
-def upsert_law(body: LawIn):
-    rows = run_write(
-        cypher.UPSERT_LAW,
-        {
-            "law_id": None,
-            "name": body.name,
-            "version": body.version,
-            "text": body.text,
-            "checksum": body.checksum,
-            "active": body.active,
-        },
+async def upsert_law(body: LawIn, full: bool = False):
+    rows = await run_write(
+        cypher.UPSERT_LAW, {**cypher.LAW_PARAMS, **body.model_dump(), "full": full}
     )
     law = _first(rows, "law")
     return {"law": law}
@@ -194,8 +228,10 @@ def upsert_law(body: LawIn):
 # Memory: Event
 # -----------------------
 @api.post("/memory/event")
-def create_event(body: EventIn):
-    rows = run_write(cypher.CREATE_EVENT, body.dict())
+async def create_event(body: EventIn, full: bool = False):
+    rows = await run_write(
+        cypher.CREATE_EVENT, {**cypher.EVENT_PARAMS, **body.model_dump(), "full": full}
+    )
     event = _first(rows, "event")
     return {"event": event}
 
@@ -203,9 +239,11 @@ def create_event(body: EventIn):
 # -----------------------
 # Queries
 # -----------------------
-@api.get("/query/why/{claim_id}", response_model=WhyChainOut)
-def why_chain(claim_id: str):
-    rows = run_read(cypher.WHY_CHAIN, {"claim_id": claim_id})
+# Documented via `responses` rather than `response_model`: the rows are already
+# shaped by Cypher, so FastAPI doesn't need to re-validate them per request.
+@api.get("/query/why/{claim_id}", responses={200: {"model": WhyChainOut}})
+async def why_chain(claim_id: str):
+    rows = await run_read(cypher.WHY_CHAIN, {"claim_id": claim_id})
     if not rows:
         raise HTTPException(status_code=404, detail="Claim not found")
     row = rows[0]
@@ -217,9 +255,8 @@ def why_chain(claim_id: str):
 
 
 @api.get("/query/latest-self/{node_id}")
-def latest_self(node_id: str):
-    rows = run_read(cypher.LATEST_SELF, {"node_id": node_id})
+async def latest_self(node_id: str, include_embed: bool = False):
+    rows = await run_read(
+        cypher.LATEST_SELF, {"node_id": node_id, "include_embed": include_embed}
+    )
     return rows[0] if rows else {}
-def latest_self(node_id: str):
-    recs = run_read(cypher.LATEST_SELF, {"node_id": node_id})
-    return recs[0] if recs else {}
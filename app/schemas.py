@@ -1,10 +1,42 @@
 # FILE: app/schemas.py
-from pydantic import BaseModel, Field, validator
-from typing import List, Optional, Literal, Any
+from pydantic import AfterValidator, BaseModel, ConfigDict, Field, PlainSerializer, field_validator, model_validator
+from typing import Annotated, List, Optional, Literal, Any
 from datetime import datetime
+from array import array
+import base64
+import json
+import sys
 
 Scope = Literal["public", "shared", "private"]
 
+def _decode_f32(b64: str) -> List[float]:
+    """Decode base64 little-endian float32 bytes into a list of floats."""
+    buf = array("f", base64.b64decode(b64, validate=True))
+    if sys.byteorder == "big":
+        buf.byteswap()
+    return buf.tolist()
+
+def _unpack_embed_b64(model):
+    """Shared after-validator for models carrying `embed` + `embed_b64`."""
+    if model.embed_b64:
+        if "embed" in model.model_fields_set:
+            raise ValueError("send either embed or embed_b64, not both")
+        model.embed = _decode_f32(model.embed_b64)
+    return model
+
+def _to_json(value: dict) -> str:
+    return json.dumps(value, separators=(",", ":"), default=str)
+
+# Neo4j can't store maps as property values, so free-form maps are dumped
+# (and stored) as JSON text.
+JsonMap = Annotated[dict, PlainSerializer(_to_json, return_type=str)]
+
+def _dedupe(ids: List[str]) -> List[str]:
+    """Drop repeated ids (first occurrence wins) so Cypher MERGEs each link once."""
+    return list(dict.fromkeys(ids))
+
+IdList = Annotated[List[str], AfterValidator(_dedupe)]
+
 class IdentityIn(BaseModel):
     node_id: str
     label: Optional[str] = None
@@ -14,6 +46,8 @@ class IdentityOut(IdentityIn):
     created_at: Optional[datetime] = None
 
 class Vector(BaseModel):
+    model_config = ConfigDict(populate_by_name=True)
+
     sigma: float
     s: float
     tau: float
@@ -21,6 +55,10 @@ class Vector(BaseModel):
     lambda_: float = Field(alias="lambda")
     rho: float
     embed: List[float] = Field(default_factory=list)
+    # alternative to `embed`: base64 of little-endian float32 (half the bytes of JSON floats)
+    embed_b64: Optional[str] = Field(default=None, exclude=True)
+
+    _unpack_embed = model_validator(mode="after")(_unpack_embed_b64)
 
 class StateUpsertIn(BaseModel):
     node_id: str
@@ -29,39 +67,51 @@ class StateUpsertIn(BaseModel):
     tags: List[str] = Field(default_factory=list)
     phase_id: Optional[str] = None
     derived_from_state_id: Optional[str] = None
-    evidence: List[str] = Field(default_factory=list)    # ids across claim/test/thought/artifact
+    evidence: IdList = Field(default_factory=list)       # ids across claim/test/thought/artifact
     feels: List[dict] = Field(default_factory=list)      # {target_id, ache, tension}
     scope: Scope = "private"
 
+    @field_validator("feels")
+    @classmethod
+    def _dedupe_feels(cls, v: List[dict]) -> List[dict]:
+        # one FEELS edge per target; the last entry for a target wins
+        return list({f.get("target_id"): f for f in v}.values())
+
 class ThoughtIn(BaseModel):
     thought_id: Optional[str] = None
     kind: Literal["thought", "code", "math", "glyphic", "note"] = "thought"
     text: str
     tokens: Optional[int] = None
     embed: List[float] = Field(default_factory=list)
+    embed_b64: Optional[str] = Field(default=None, exclude=True)  # see Vector.embed_b64
     ache: float = 0.0
     drift: float = 0.0
-    glyph_ids: List[str] = Field(default_factory=list)
-    mentions_claim_ids: List[str] = Field(default_factory=list)
+    glyph_ids: IdList = Field(default_factory=list)
+    mentions_claim_ids: IdList = Field(default_factory=list)
     source_id: Optional[str] = None
 
+    _unpack_embed = model_validator(mode="after")(_unpack_embed_b64)
+
 class ClaimIn(BaseModel):
     claim_id: Optional[str] = None
     text: str
     truthiness: float = 0.5
     confidence: float = 0.5
-    support_ids: List[str] = Field(default_factory=list)
-    contradicts_ids: List[str] = Field(default_factory=list)
+    support_ids: IdList = Field(default_factory=list)
+    contradicts_ids: IdList = Field(default_factory=list)
 
 class RitualIn(BaseModel):
+    ritual_id: Optional[str] = None
     name: str
     code: str
     version: str
     checksum: str
     effect: Optional[str] = None
-    applies_to: List[str] = Field(default_factory=list)
+    meta: JsonMap = Field(default_factory=dict)
+    applies_to: IdList = Field(default_factory=list)
 
 class LawIn(BaseModel):
+    law_id: Optional[str] = None
     name: str
     version: str
     text: str
@@ -71,15 +121,15 @@ class LawIn(BaseModel):
 class ConsentIn(BaseModel):
     node_id: str
     scope: Scope
-    conditions: dict = Field(default_factory=dict)
+    conditions: JsonMap = Field(default_factory=dict)
     granted_at: Optional[datetime] = None
     revoked_at: Optional[datetime] = None
 
 class EventIn(BaseModel):
     name: str
     when: datetime
-    meta: dict = Field(default_factory=dict)
-    updates: List[str] = Field(default_factory=list)
+    meta: JsonMap = Field(default_factory=dict)
+    updates: IdList = Field(default_factory=list)
 
 class WhyChainOut(BaseModel):
     claim: dict
@@ -0,0 +1,64 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app import db, routes
+from app.main import app
+
+
+class FakeResult:
+    def __init__(self, rows):
+        self._rows = rows
+
+    async def data(self):
+        return self._rows
+
+
+class FakeTx:
+    def __init__(self, respond):
+        self._respond = respond
+
+    async def run(self, cypher, params=None):
+        return FakeResult(self._respond(cypher, params or {}))
+
+
+class FakeSession:
+    def __init__(self, respond):
+        self._tx = FakeTx(respond)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute_read(self, work, *args):
+        return await work(self._tx, *args)
+
+    execute_write = execute_read
+
+
+class FakeDriver:
+    """Stands in for AsyncDriver; `respond(cypher, params)` supplies each result's rows."""
+
+    def __init__(self):
+        self.respond = lambda cypher, params: []
+        self.calls = []
+
+    def session(self, **kwargs):
+        def respond(cypher, params):
+            self.calls.append((cypher, params))
+            return self.respond(cypher, params)
+        return FakeSession(respond)
+
+
+@pytest.fixture
+def neo4j(monkeypatch):
+    driver = FakeDriver()
+    monkeypatch.setattr(db, "get_driver", lambda: driver)
+    routes._consent_cache.clear()
+    return driver
+
+
+@pytest.fixture
+def client(neo4j):
+    return TestClient(app)
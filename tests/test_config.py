@@ -0,0 +1,19 @@
+from app.config import Settings
+
+
+def test_liveness_check_can_be_disabled_from_env(monkeypatch):
+    monkeypatch.setenv("NEO4J_LIVENESS_CHECK_TIMEOUT", "None")
+    assert Settings().NEO4J_LIVENESS_CHECK_TIMEOUT is None
+
+    monkeypatch.setenv("NEO4J_LIVENESS_CHECK_TIMEOUT", "12.5")
+    assert Settings().NEO4J_LIVENESS_CHECK_TIMEOUT == 12.5
+
+
+def test_other_settings_keep_a_literal_none_string(monkeypatch):
+    monkeypatch.setenv("NEO4J_PASSWORD", "None")
+    monkeypatch.setenv("NEO4J_LIVENESS_CHECK_TIMEOUT", "")
+
+    settings = Settings()
+
+    assert settings.NEO4J_PASSWORD == "None"
+    assert settings.NEO4J_LIVENESS_CHECK_TIMEOUT is None
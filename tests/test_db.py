@@ -0,0 +1,56 @@
+from neo4j.time import DateTime, Duration
+
+from app import cypher
+
+
+def test_temporal_values_are_returned_as_iso_strings(neo4j, client):
+    created = DateTime(2025, 1, 2, 3, 4, 5)
+    neo4j.respond = lambda q, p: [
+        {"thought": {"thought_id": "t1", "kind": "thought", "created_at": created}}
+    ]
+
+    resp = client.post("/memory/thought", json={"text": "hello"})
+
+    assert resp.status_code == 200
+    assert resp.json() == {
+        "thought": {"thought_id": "t1", "kind": "thought", "created_at": "2025-01-02T03:04:05"}
+    }
+
+
+def test_nested_temporal_values_are_converted(neo4j, client):
+    neo4j.respond = lambda q, p: [{
+        "state": {"state_id": "s1", "created_at": DateTime(2025, 1, 2)},
+        "evidence": [{"claim_id": "c1", "age": Duration(days=2)}],
+        "affect": [],
+    }]
+
+    body = client.get("/query/latest-self/n1").json()
+
+    assert body["state"]["created_at"] == "2025-01-02T00:00:00"
+    assert body["evidence"] == [{"claim_id": "c1", "age": "P2D"}]
+    assert neo4j.calls[0][0] == cypher.LATEST_SELF
+
+
+def test_write_routes_default_to_compact_projection(neo4j, client):
+    neo4j.respond = lambda q, p: [{"claim": {"claim_id": "c1"}}]
+
+    client.post("/memory/claim", json={"text": "sky is blue"})
+    client.post("/memory/claim?full=true", json={"text": "sky is blue"})
+
+    assert [params["full"] for _, params in neo4j.calls] == [False, True]
+
+
+def test_driver_is_closed_on_shutdown(monkeypatch):
+    from fastapi.testclient import TestClient
+
+    from app import main
+
+    closed = []
+
+    async def close():
+        closed.append(True)
+
+    monkeypatch.setattr(main, "close_driver", close)
+    with TestClient(main.app):
+        assert closed == []
+    assert closed == [True]
@@ -0,0 +1,84 @@
+from app import cypher
+
+STATE = {
+    "node_id": "n1",
+    "t": 1,
+    "vector": {"sigma": 1, "s": 1, "tau": 1, "chi": 1, "lambda": 1, "rho": 1},
+    "scope": "shared",
+}
+
+
+def test_state_upsert_without_consent_is_forbidden(neo4j, client):
+    neo4j.respond = lambda q, p: [{"consent_ok": False, "state": None}]
+
+    resp = client.post("/memory/state/upsert", json=STATE)
+
+    assert resp.status_code == 403
+    assert resp.json()["detail"] == "Consent not granted for this scope"
+
+
+def test_state_upsert_with_consent_returns_state(neo4j, client):
+    neo4j.respond = lambda q, p: [{"consent_ok": True, "state": {"state_id": "s1", "t": 1}}]
+
+    resp = client.post("/memory/state/upsert", json=STATE)
+
+    assert resp.status_code == 200
+    assert resp.json() == {"state": {"state_id": "s1", "t": 1}}
+    (query, params), = neo4j.calls
+    assert query == cypher.UPSERT_STATE
+    assert params["scope"] == "shared"
+    assert params["node_id"] == "n1"
+    assert params["lambda"] == 1.0
+
+
+def _guard_reads(neo4j):
+    return [q for q, _ in neo4j.calls if q == cypher.CONSENT_GUARD]
+
+
+def _respond(allowed):
+    def respond(query, params):
+        if query == cypher.CONSENT_GUARD:
+            return [{"allowed": allowed}]
+        return [{"state": {"state_id": "s1"}} for _ in params.get("rows", [])]
+    return respond
+
+
+def test_batch_consent_grant_is_cached(neo4j, client):
+    neo4j.respond = _respond(True)
+
+    assert client.post("/memory/state/batch", json=[STATE]).status_code == 200
+    assert client.post("/memory/state/batch", json=[STATE]).status_code == 200
+
+    assert len(_guard_reads(neo4j)) == 1
+
+
+def test_cached_denial_is_cleared_by_new_consent(neo4j, client):
+    neo4j.respond = _respond(False)
+
+    assert client.post("/memory/state/batch", json=[STATE]).status_code == 403
+    assert client.post("/memory/state/batch", json=[STATE]).status_code == 403
+    assert len(_guard_reads(neo4j)) == 1
+
+    neo4j.respond = lambda q, p: [{"consent": {"consent_id": "c1"}}]
+    client.post("/memory/consent", json={"node_id": "n1", "scope": "public"})
+
+    neo4j.respond = _respond(True)
+    assert client.post("/memory/state/batch", json=[STATE]).status_code == 200
+    assert len(_guard_reads(neo4j)) == 2
+
+
+def test_batch_is_split_into_batch_size_transactions(neo4j, client):
+    neo4j.respond = lambda q, p: [{"thought": {"thought_id": r["text"]}} for r in p["rows"]]
+
+    resp = client.post("/memory/thought/batch?batch_size=1", json=[{"text": "a"}, {"text": "b"}])
+
+    assert resp.json() == {"thoughts": [{"thought_id": "a"}, {"thought_id": "b"}]}
+    assert [q for q, _ in neo4j.calls] == [cypher.UPSERT_THOUGHTS] * 2
+    assert [len(p["rows"]) for _, p in neo4j.calls] == [1, 1]
+
+
+def test_empty_batch_writes_nothing(neo4j, client):
+    resp = client.post("/memory/thought/batch", json=[])
+
+    assert resp.json() == {"thoughts": []}
+    assert neo4j.calls == []
@@ -0,0 +1,47 @@
+import base64
+import struct
+
+import pytest
+from pydantic import ValidationError
+
+from app.schemas import ConsentIn, EventIn, RitualIn, ThoughtIn, Vector
+
+
+def test_map_fields_dump_as_json_text():
+    ritual = RitualIn(name="r", code="c", version="1", checksum="k", meta={"a": [1, 2]})
+    event = EventIn(name="e", when="2025-01-02T00:00:00")
+    consent = ConsentIn(node_id="n", scope="public", conditions={"until": "2026"})
+
+    assert ritual.model_dump()["meta"] == '{"a":[1,2]}'
+    assert event.model_dump()["meta"] == "{}"
+    assert consent.model_dump()["conditions"] == '{"until":"2026"}'
+
+
+def test_id_lists_drop_repeats_in_order():
+    thought = ThoughtIn(text="t", glyph_ids=["a", "b", "a"], mentions_claim_ids=["c", "c"])
+    event = EventIn(name="e", when="2025-01-02T00:00:00", updates=["u2", "u1", "u2"])
+
+    assert thought.glyph_ids == ["a", "b"]
+    assert thought.mentions_claim_ids == ["c"]
+    assert event.updates == ["u2", "u1"]
+
+
+def test_embed_b64_decodes_little_endian_float32():
+    packed = base64.b64encode(struct.pack("<3f", 1.5, -2.0, 0.25)).decode()
+
+    thought = ThoughtIn(text="t", embed_b64=packed)
+    vector = Vector(sigma=1, s=1, tau=1, chi=1, rho=1, embed_b64=packed, **{"lambda": 1})
+
+    assert thought.embed == [1.5, -2.0, 0.25]
+    assert vector.embed == [1.5, -2.0, 0.25]
+    assert "embed_b64" not in thought.model_dump()
+
+
+def test_embed_and_embed_b64_together_are_rejected(client):
+    packed = base64.b64encode(struct.pack("<f", 1.0)).decode()
+
+    resp = client.post("/memory/thought", json={"text": "t", "embed": [1.0], "embed_b64": packed})
+
+    assert resp.status_code == 422
+    with pytest.raises(ValidationError):
+        ThoughtIn(text="t", embed=[], embed_b64=packed)